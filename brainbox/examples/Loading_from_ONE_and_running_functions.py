@@ -63,7 +63,7 @@ tmplts_b = aio.load_object(path_to_alf_out, 'templates')
 
 # Convert spikes bunch into a units bunch
 units_b = bb.processing.get_units_bunch(spks_b)  # this may take a few mins
-unit4_amps = units_b['amps']['4']  # get amplitudes for unit 4.
+unit4_amps = units_b['amps'][4]  # get amplitudes for unit 4.
 
 # Filter units according to some parameters
 T = spks_b['times'][-1] - spks_b['times'][0]
@@ -74,7 +74,7 @@ filtered_units = bb.processing.filter_units(units_b, T, min_amp=0, min_fr=0.5, m
 # two sets of waveforms.
 n_ch_wf = 10  # number of channels on which to extract waveforms
 n_ch_probe = 385  # number of channels in recording
-ts = units_b['times']['1']
+ts = units_b['times'][1]
 max_ch = max_ch = clstrs_b['channels'][1]
 if max_ch < (n_ch_wf // 2):  # take only channels greater than `max_ch`.
     ch = np.arange(max_ch, max_ch + n_ch_wf)
@@ -101,12 +101,12 @@ var_vals_f, p_vals_f = bb.plot.feat_vars(units_b, units=filtered_units, feat_nam
 fig4 = plt.gcf()
 
 # Plot distribution cutoff of a spike feature for a single unit
-amps = units_b['amps']['1']
+amps = units_b['amps'][1]
 fraction_missing = bb.plot.missed_spikes_est(amps, feat_name='amps')
 fig5 = plt.gcf()
 
 # Plot and compare two sets of waveforms from two different time epochs for a single unit
-ts = units_b['times']['1']
+ts = units_b['times'][1]
 ts1 = ts[np.where(ts < 60)[0]]
 ts2 = ts[np.where(ts > 180)[0][:len(ts1)]]
 wf_1, wf_2, s = bb.plot.wf_comp(path_to_ephys_file, ts1, ts2, ch, car=True)  # may take a few mins
@@ -126,7 +126,7 @@ fig9 = plt.gcf()
 fig9.axes[0].set_xlabel('Time (s)')
 fig9.axes[0].set_xlabel('Voltage (V)')
 
-depths = units_b.depths['1']
+depths = units_b.depths[1]
 cum_drift_depth, max_drift_depth = bb.plot.driftmap(ts, depths)
 fig10 = plt.gcf()
 fig10.axes[0].set_xlabel('Time (s)')
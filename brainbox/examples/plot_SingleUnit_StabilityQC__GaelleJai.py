@@ -83,7 +83,7 @@ fig1, wf1, wf2 = bb.plot.single_unit_wf_comp(ephys_file_path, spks, clstrs, unit
 # Get a units bunch, and plot waveforms for unit2 from the first to second minute
 # across 15 channels.
 units = bb.processing.get_units_bunch(spks, ['times'])
-ts1 = units['times']['2'][:50]
-ts2 = units['times']['2'][-50:]
+ts1 = units['times'][2][:50]
+ts2 = units['times'][2][-50:]
 fig2, wf1_2, wf2_2 = bb.plot.single_unit_wf_comp(ephys_file_path, spks, clstrs, unit=1, ts1=ts1,
                                                  ts2=ts2)
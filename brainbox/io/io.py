@@ -52,7 +52,7 @@ def extract_waveforms(ephys_file, ts, ch, t=2.0, sr=30000, n_ch_probe=385, dtype
         >>> units_b = bb.processing.get_units_bunch(spks, ['times'])
         # Get the timestamps and 20 channels around the max amp channel for unit1, and extract the
         # two sets of waveforms.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> max_ch = max_ch = clstrs_b['channels'][1]
         >>> if max_ch < 10:  # take only channels greater than `max_ch`.
         >>>     ch = np.arange(max_ch, max_ch + 20)
@@ -134,7 +134,7 @@ def unit_stability(units_b, units=None, feat_names=['amps'], dist='norm', test='
         cv_feat = Bunch((unit, 0) for unit in unit_list)
         for unit in unit_list:
             # If we're missing units/features, create a NaN placeholder and skip them:
-            if len(units_b['times'][str(unit)]) == 0:
+            if len(units_b['times'][unit]) == 0:
                 p_val = np.nan
                 cv = np.nan
             else:
@@ -142,8 +142,8 @@ def unit_stability(units_b, units=None, feat_names=['amps'], dist='norm', test='
                 _, p_val = test_fun(units_b[feat][unit], dist)
                 cv = np.var(units_b[feat][unit]) / np.mean(units_b[feat][unit])
             # Append current unit's values to list of units' values for current feature:
-            p_vals_feat[str(unit)] = p_val
-            cv_feat[str(unit)] = cv
+            p_vals_feat[unit] = p_val
+            cv_feat[unit] = cv
         p_vals_b[feat] = p_vals_feat
         cv_b[feat] = cv_feat
 
@@ -187,7 +187,7 @@ def missed_spikes_est(feat, spks_per_bin=20, sigma=5, min_num_bins=50):
     1) Determine the fraction of spikes missing from unit 1 based on the recorded unit's spike
     amplitudes, assuming the distribution of the unit's spike amplitudes is symmetric.
         # Get unit 1 amplitudes from a unit bunch, and compute fraction spikes missing.
-        >>> feat = units_b['amps']['1']
+        >>> feat = units_b['amps'][1]
         >>> fraction_missing = bb.plot.feat_cutoff(feat)
     """
 
@@ -251,8 +251,8 @@ def wf_similarity(wf1, wf2):
         >>>    ch = np.arange(max_ch - 20, max_ch)
         >>> else:  # take `n_c_ch` around `max_ch`.
         >>>     ch = np.arange(max_ch - 10, max_ch + 10)
-        >>> ts1 = units_b['times']['1'][:100]
-        >>> ts2 = units_b['times']['1'][-100:]
+        >>> ts1 = units_b['times'][1][:100]
+        >>> ts2 = units_b['times'][1][-100:]
         >>> wf1 = bb.io.extract_waveforms(path_to_ephys_file, ts1, ch)
         >>> wf2 = bb.io.extract_waveforms(path_to_ephys_file, ts2, ch)
         >>> s = bb.metrics.wf_similarity(wf1, wf2)
@@ -328,8 +328,8 @@ def firing_rate_coeff_var(ts, hist_win=0.01, fr_win=0.5, n_bins=10):
     1) Compute the coefficient of variation of the firing rate for unit 1 from the time of its
     first to last spike, and compute the coefficient of variation of the firing rate for unit 2
     from the first to second minute.
-        >>> ts_1 = units_b['times']['1']
-        >>> ts_2 = units_b['times']['2']
+        >>> ts_1 = units_b['times'][1]
+        >>> ts_2 = units_b['times'][2]
         >>> ts_2 = np.intersect1d(np.where(ts_2 > 60)[0], np.where(ts_2 < 120)[0])
         >>> cv, cvs, fr = bb.metrics.firing_rate_coeff_var(ts_1)
         >>> cv_2, cvs_2, fr_2 = bb.metrics.firing_rate_coeff_var(ts_2)
@@ -385,8 +385,8 @@ def firing_rate_fano_factor(ts, hist_win=0.01, fr_win=0.5, n_bins=10):
     1) Compute the fano factor of the firing rate for unit 1 from the time of its
     first to last spike, and compute the fano factor of the firing rate for unit 2
     from the first to second minute.
-        >>> ts_1 = units_b['times']['1']
-        >>> ts_2 = units_b['times']['2']
+        >>> ts_1 = units_b['times'][1]
+        >>> ts_2 = units_b['times'][2]
         >>> ts_2 = np.intersect1d(np.where(ts_2 > 60)[0], np.where(ts_2 < 120)[0])
         >>> ff, ffs, fr = bb.metrics.firing_rate_fano_factor(ts_1)
         >>> ff_2, ffs_2, fr_2 = bb.metrics.firing_rate_fano_factor(ts_2)
@@ -504,7 +504,7 @@ def pres_ratio(ts, hist_win=10):
     Examples
     --------
     1) Compute the presence ratio for unit 1, given a window of 10 s.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> pr, pr_bins = bb.metrics.pres_ratio(ts)
     """
 
@@ -550,7 +550,7 @@ def ptp_over_noise(ephys_file, ts, ch, t=2.0, sr=30000, n_ch_probe=385, dtype='i
     --------
     1) Compute ptp_over_noise for all spikes on 20 channels around the channel of max amplitude
     for unit 1.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> max_ch = max_ch = clstrs_b['channels'][1]
         >>> if max_ch < 10:  # take only channels greater than `max_ch`.
         >>>     ch = np.arange(max_ch, max_ch + 20)
@@ -628,7 +628,7 @@ def contamination_ks2(ts, rp=0.002):
     Examples
     --------
     1) Compute contamination estimate for unit 1.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> ce = bb.metrics.contamination(ts)
     """
 
@@ -682,7 +682,7 @@ def contamination(ts, min_time, max_time, rp=0.002, min_isi=0.0001):
     --------
     1) Compute contamination estimate for unit 1, with a minimum isi for counting duplicate
     spikes of 0.1 ms.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> ce = bb.metrics.contamination_ks2(ts, min_isi=0.0001)
     """
 
@@ -758,7 +758,7 @@ def slidingRP_viol(ts, bin_size=0.25, thresh=0.1, acceptThresh=0.1):
     1) Compute whether a unit has too much refractory period contamination at
     any possible value of a refractory period, for a 0.25 ms bin, with a
     threshold of 10% acceptable contamination
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> didpass = bb.metrics.slidingRP_viol(ts, bin_size=0.25, thresh=0.1,
                                                 acceptThresh=0.1)
     """
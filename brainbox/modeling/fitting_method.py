@@ -27,9 +27,13 @@ class MaximumLikelihoodEstimation(FittingMethod):
     def fit(self):
 
         print('Maximum Likelihood fitting')
-        # get the bounds and typical value
-        x0 = [p.typical_value for p in self.model.parameter_list]
-        bounds = [[p.bounds_hard[0], p.bounds_hard[1]] for p in self.model.parameter_list]
+        # get the bounds and typical value, precomputed by the model when available
+        x0 = getattr(self.model, 'x0', None)
+        if x0 is None:
+            x0 = [p.typical_value for p in self.model.parameter_list]
+        bounds = getattr(self.model, 'bounds', None)
+        if bounds is None:
+            bounds = [[p.bounds_hard[0], p.bounds_hard[1]] for p in self.model.parameter_list]
 
         def neg_loglikelihood_function(x, _model, _data):
             ll = _model.loglikelihood_function(x, _model, _data)
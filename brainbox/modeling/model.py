@@ -2,12 +2,77 @@
 International Brain Laboratory, 2019
 """
 
+import math
+
 import numpy as np
+import pandas as pd
 from parameter import Parameter
-from scipy.special import erf
-import seaborn as sns
-import matplotlib.pyplot as plt
-import statsmodels.stats.proportion as sm
+from scipy.special import erf, log_ndtr, ndtr
+
+try:
+    from numba import njit, vectorize
+except ModuleNotFoundError:
+    njit = vectorize = None
+
+_EPS = np.finfo(np.float64).eps
+_SQRT2 = math.sqrt(2.)
+
+
+def _log_half_erfc(t):
+    """log(erfc(t) / 2), i.e. the log of the erf psychometric tail probability, stable over the
+    whole float64 range: erfc itself underflows to 0 around t = 27, so the far tail switches to
+    the asymptotic expansion erfc(t) ~ exp(-t^2) / (t sqrt(pi)) * (1 - 1/(2 t^2) + 3/(4 t^4))."""
+    if t < 25.:
+        return math.log(0.5 * math.erfc(t))
+    r = 1. / (t * t)
+    return -t * t - math.log(2. * t) - 0.5 * math.log(math.pi) \
+        + math.log1p(r * (0.75 * r - 0.5))
+
+
+if njit is not None:
+    _log_half_erfc = njit(cache=True)(_log_half_erfc)
+
+
+def _psycho_ll(params, x, k_right, k_left):
+    """Erf psychometric log-likelihood as a single fused loop, so that numba can compile it
+    without a Python frame per optimizer/simulator call. Falls back to plain Python (slow but
+    correct) when numba is not installed; loglikelihood_function then uses the numpy path."""
+    mu, sigma, lapse_l, lapse_r = params[0], params[1], params[2], params[3]
+    ll = 0.
+    if lapse_l == 0. and lapse_r == 0.:
+        # no lapses: probabilities can reach 0/1, so stay in log space (erf(z) + 1 == erfc(-z)),
+        # which keeps the tails accurate without clipping against eps
+        for i in range(x.size):
+            z = (x[i] - mu) / sigma
+            if k_right[i] > 0.:
+                ll += k_right[i] * _log_half_erfc(-z)
+            if k_left[i] > 0.:
+                ll += k_left[i] * _log_half_erfc(z)
+        return ll
+    for i in range(x.size):
+        p = lapse_l + (1. - lapse_l - lapse_r) * 0.5 * math.erfc(-(x[i] - mu) / sigma)
+        if p < _EPS:
+            p = _EPS
+        elif p > 1. - _EPS:
+            p = 1. - _EPS
+        ll += k_right[i] * math.log(p) + k_left[i] * math.log1p(-p)
+    return ll
+
+
+if njit is not None:
+    _psycho_ll = njit(fastmath=True, cache=True)(_psycho_ll)
+
+
+def _psycho_p(x, mu, sigma, lapse_l, lapse_r):
+    """Erf psychometric curve as a scalar kernel (erf(z) + 1 == erfc(-z)), compiled into a ufunc
+    below so evaluating it over a stimulus vector is a single fused pass with one output
+    allocation, instead of the seven temporaries of the equivalent numpy expression."""
+    return lapse_l + (1. - lapse_l - lapse_r) * 0.5 * math.erfc(-(x - mu) / sigma)
+
+
+if vectorize is not None:
+    _psycho_p = vectorize(['float64(float64, float64, float64, float64, float64)'],
+                          cache=True)(_psycho_p)
 
 
 class Model:
@@ -30,9 +95,14 @@ class PsychometricFunction(Model):
         Grab different functions from psignifit, etc
     """
 
-    def __init__(self, model_name='choice_erf_2lapses', data=[]):
-
+    def __init__(self, model_name='choice_erf_2lapses', data=[], fp32=False):
+        """
+        :param fp32: evaluate the likelihood in single precision. Halves the memory traffic of
+            the cached arrays, which is plenty for simulation / SBI workloads matched to FP32
+            networks; leave False (double precision) when fitting parameters for reporting.
+        """
         self.model_name = model_name
+        self._dtype = np.float32 if fp32 else np.float64
         # ================================================== #
         # STANDARD PSYCHOMETRIC FUNCTION FOR IBL ROOT TASK
         # ================================================== #
@@ -62,9 +132,21 @@ class PsychometricFunction(Model):
                           bounds_hard=[0, 0.5],
                           range_plausible=[0, 0.3],
                           typical_value=0.1)]
-            self.function = \
-                lambda x, params: params[2] + (1 - params[2] - params[3]) \
-                * (erf((x - params[0]) / params[1]) + 1) / 2
+            if vectorize is not None:
+                self.function = \
+                    lambda x, params: _psycho_p(x, params[0], params[1], params[2], params[3])
+            else:
+                self.function = \
+                    lambda x, params: params[2] + (1 - params[2] - params[3]) \
+                    * (erf((x - params[0]) / params[1]) + 1) / 2
+            # compiled likelihood kernel, dispatched to by loglikelihood_function
+            self._ll_kernel = _psycho_ll if njit is not None else None
+            # optimizer-ready starting point and (K, 2) bounds, assembled once here instead of
+            # being rebuilt from the parameter list on every fit
+            self.x0 = np.array([p.typical_value for p in self.parameter_list],
+                               dtype=np.float64)
+            self.bounds = np.array([p.bounds_hard for p in self.parameter_list],
+                                   dtype=np.float64)
 
         elif model_name == 'correct_weibull':
             pass
@@ -75,20 +157,41 @@ class PsychometricFunction(Model):
 
     def loglikelihood_function(self, params, _model, _data):
 
-        # evaluation of the model with these parameters
-        probs = _model.function(_data.preproc_df.signed_stimulus, params)
-        assert (max(probs) <= 1) or (min(probs) >= 0), 'Probs must be between 0 and 1'
+        # with numba installed, run the whole evaluation in one compiled pass
+        if getattr(_model, '_ll_kernel', None) is not None:
+            return _model._ll_kernel(np.asarray(params, dtype=np.float64),
+                                     _model._x, _model._k_right, _model._k_left)
+
+        # evaluation of the model on the cached stimulus grid: the optimizer calls this once
+        # per iteration and pandas Series overhead dominates otherwise
+        mu, sigma, lapse_l, lapse_r = params[0], params[1], params[2], params[3]
+        if lapse_l == 0 and lapse_r == 0:
+            # no lapses: probabilities can reach 0/1, so evaluate in log space through
+            # log_ndtr, which stays accurate in the tails without clipping against eps
+            z = (_model._x - mu) * (_SQRT2 / sigma)
+            return _model._k_right @ log_ndtr(z) + _model._k_left @ log_ndtr(-z)
+        probs = _model._probability_right(mu, sigma, lapse_l, lapse_r)
 
-        # avoid numerical problems
-        probs[probs == 0] = np.finfo(float).eps
-        probs[probs == 1] = 1 - np.finfo(float).eps
+        # avoid numerical problems at probs == 0 or 1
+        eps = np.finfo(probs.dtype).eps
+        np.clip(probs, eps, 1 - eps, out=probs)
 
-        # ll of data given parameters - use _data.preproc_df
-        ll = sum(_data.preproc_df.total_trial_number *
-                 (_data.preproc_df.fraction_right * np.log(probs) +
-                  (1 - _data.preproc_df.fraction_right) * np.log(1 - probs)))
+        # ll of data given parameters; log1p(-p) stays accurate where p is close to 1 and
+        # reuses the probs buffer rather than allocating a second array
+        ll = _model._k_right @ np.log(probs)
+        np.negative(probs, out=probs)
+        np.log1p(probs, out=probs)
+        ll += _model._k_left @ probs
         return ll
 
+    def _probability_right(self, mu, sigma, lapse_l, lapse_r):
+        """Evaluates P(right) on the cached stimulus grid with the parameters passed explicitly,
+        avoiding the per-index tuple accesses of the generic `function` lambda. The Gaussian CDF
+        ndtr(sqrt(2) * z) replaces (erf(z) + 1) / 2. On the typical 9-level grid this is one
+        special-function call plus a single fused arithmetic pass."""
+        z = (self._x - mu) * (_SQRT2 / sigma)
+        return lapse_l + (1. - lapse_l - lapse_r) * ndtr(z)
+
     # ================================================== #
     # MODEL-DEPENDENT PREPROCESSING
     # ================================================== #
@@ -96,12 +199,25 @@ class PsychometricFunction(Model):
     def preprocess_data(self, data):
 
         if 'choice' in self.model_name:
-            # make dataframe with columns signed_stimulus, total_trial_number, fraction_right
+            # make dataframe with columns signed_stimulus, total_trial_number, fraction_right;
+            # grouping through np.unique / np.bincount rather than pandas groupby.agg, which
+            # dominates the runtime when preprocessing is redone per bootstrap / simulation
             print("Summarizing TrialData")
-            data.preproc_df = data.trials_df.groupby('signed_stimulus').agg(
-                {'choice': 'count', 'choice_right': 'mean'}).reset_index()
-            data.preproc_df.rename(columns={'choice': 'total_trial_number',
-                                   'choice_right': 'fraction_right'}, inplace=True)
+            signed_stimulus = data.trials_df['signed_stimulus'].to_numpy()
+            choice = data.trials_df['choice'].to_numpy(dtype=np.float64)
+            choice_right = data.trials_df['choice_right'].to_numpy(dtype=np.float64)
+            levels, inv = np.unique(signed_stimulus, return_inverse=True)
+            # counts and means ignore nans, as the groupby 'count' / 'mean' aggregations did
+            n_trials = np.bincount(inv, weights=~np.isnan(choice), minlength=levels.size)
+            ivalid = ~np.isnan(choice_right)
+            n_right = np.bincount(inv[ivalid], weights=choice_right[ivalid],
+                                  minlength=levels.size)
+            n_valid = np.bincount(inv[ivalid], minlength=levels.size)
+            with np.errstate(invalid='ignore'):
+                fraction_right = n_right / n_valid
+            data.preproc_df = pd.DataFrame({'signed_stimulus': levels,
+                                            'total_trial_number': n_trials.astype(np.int64),
+                                            'fraction_right': fraction_right})
         elif 'correct' in self.name:
             print('not implemented yet')
             pass
@@ -110,6 +226,14 @@ class PsychometricFunction(Model):
         for v in self.variable_names:
             assert v in data.preproc_df.columns, ('preproc_df needs column %s' % v)
 
+        # cache the preprocessed columns as contiguous numpy arrays for the likelihood
+        # evaluation, with right/left response counts precomputed; the stimulus grid is fixed
+        # across optimizer / bootstrap iterations so it is frozen here once
+        self._x = np.ascontiguousarray(data.preproc_df.signed_stimulus, dtype=self._dtype)
+        self._n = data.preproc_df.total_trial_number.to_numpy(dtype=self._dtype)
+        self._k_right = self._n * data.preproc_df.fraction_right.to_numpy(dtype=self._dtype)
+        self._k_left = self._n - self._k_right
+
         return data
 
     # ================================================== #
@@ -118,6 +242,13 @@ class PsychometricFunction(Model):
 
     def plot(self, fittedoutput, plot_data=True, plot_fit=True, **kwargs):
 
+        # plotting-only dependencies are imported lazily: seaborn/matplotlib/statsmodels add
+        # seconds of import time per interpreter, paid by every worker process in fitting and
+        # simulation pipelines that never plot
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        import statsmodels.stats.proportion as sm
+
         if 'choice' in fittedoutput.model.model_name:
 
             fig, ax = plt.subplots()
@@ -90,10 +90,10 @@ def feat_vars(units_b, units=None, feat_name='amps', dist='norm', test='ks', cma
     # Remove any empty units. This must be done AFTER the above calculations for ALL units so that
     # we can keep direct indexing.
     empty_unit_idxs = np.where([len(units_b['times'][unit]) == 0 for unit in unit_list])[0]
-    good_units = [unit for unit in unit_list if unit not in empty_unit_idxs.astype(str)]
+    good_units = [unit for unit in unit_list if unit not in empty_unit_idxs]
 
     # Get mean depths of spikes for good units
-    depths = np.asarray([np.mean(units_b['depths'][str(unit)]) for unit in good_units])
+    depths = np.asarray([np.mean(units_b['depths'][unit]) for unit in good_units])
 
     # Create unit normalized colormap based on `depths`, sorted by depth.
     cmap = plt.cm.get_cmap(cmap_name)
@@ -155,7 +155,7 @@ def missed_spikes_est(feat, feat_name, spks_per_bin=20, sigma=5, min_num_bins=50
     --------
     1) Plot cutoff line indicating the fraction of spikes missing from a unit based on the recorded
     unit's spike amplitudes, assuming the distribution of the unit's spike amplitudes is symmetric.
-        >>> feat = units_b['amps']['1']
+        >>> feat = units_b['amps'][1]
         >>> fraction_missing = bb.plot.missed_spikes_est(feat, feat_name='amps', unit=1)
     '''
 
@@ -242,8 +242,8 @@ def wf_comp(ephys_file, ts1, ts2, ch, sr=30000, n_ch_probe=385, dtype='int16', c
     of max amplitude, and compare the waveforms in the first minute to the waveforms in the fourth
     minutes for unit2, across 10 channels around the mean.
         # Get first and last 100 spikes, and 20 channels around channel of max amp for unit 1:
-        >>> ts1 = units_b['times']['1'][:100]
-        >>> ts2 = units_b['times']['1'][-100:]
+        >>> ts1 = units_b['times'][1][:100]
+        >>> ts2 = units_b['times'][1][-100:]
         >>> max_ch = clstrs_b['channels'][1]
         >>> if max_ch < n_c_ch:  # take only channels greater than `max_ch`.
         >>>     ch = np.arange(max_ch, max_ch + 20)
@@ -253,7 +253,7 @@ def wf_comp(ephys_file, ts1, ts2, ch, sr=30000, n_ch_probe=385, dtype='int16', c
         >>>     ch = np.arange(max_ch - 10, max_ch + 10)
         >>> wf1, wf2, s = bb.plot.wf_comp(path_to_ephys_file, ts1, ts2, ch)
         # Plot waveforms for unit2 from the first and fourth minutes across 10 channels.
-        >>> ts = units_b['times']['2']
+        >>> ts = units_b['times'][2]
         >>> ts1_2 = ts[np.where(ts<60)[0]]
         >>> ts2_2 = ts[np.where(ts>180)[0][:len(ts1)]]
         >>> max_ch = clstrs_b['channels'][2]
@@ -330,7 +330,7 @@ def amp_heatmap(ephys_file, ts, ch, sr=30000, n_ch_probe=385, dtype='int16', cma
     --------
     1) Plot a heatmap of the spike amplitudes across 20 channels around the channel of max
     amplitude for all spikes in unit 1.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> max_ch = clstrs_b['channels'][1]
         >>> if max_ch < n_c_ch:  # take only channels greater than `max_ch`.
         >>>     ch = np.arange(max_ch, max_ch + 20)
@@ -439,7 +439,7 @@ def firing_rate(ts, hist_win=0.01, fr_win=0.5, n_bins=10, show_fr_cv=True, ax=No
     --------
     1) Plot the firing rate for unit 1 from the time of its first to last spike, showing the cv
     of the firing rate for 10 evenly spaced bins.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> fr, cv, cvs = bb.plot.firing_rate(ts)
     '''
 
@@ -648,12 +648,12 @@ def driftmap(ts, feat, ax=None, plot_style='bincount',
     Examples
     --------
     1) Plot the amplitude driftmap for unit 1.
-        >>> ts = units_b['times']['1']
-        >>> amps = units_b['amps']['1']
+        >>> ts = units_b['times'][1]
+        >>> amps = units_b['amps'][1]
         >>> cd, md = bb.plot.driftmap(ts, amps)
     2) Plot the depth driftmap for unit 1.
-        >>> ts = units_b['times']['1']
-        >>> depths = units_b['depths']['1']
+        >>> ts = units_b['times'][1]
+        >>> depths = units_b['depths'][1]
         >>> cd, md = bb.plot.driftmap(ts, depths)
     """
     iok = ~np.isnan(feat)
@@ -707,7 +707,7 @@ def pres_ratio(ts, hist_win=10, ax=None):
     Examples
     --------
     1) Plot the presence ratio for unit 1, given a window of 10 s.
-        >>> ts = units_b['times']['1']
+        >>> ts = units_b['times'][1]
         >>> pr, pr_bins = bb.plot.pres_ratio(ts)
     '''
 
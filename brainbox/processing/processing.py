@@ -3,11 +3,68 @@ Processes data from one form into another, e.g. taking spike times and binning t
 non-overlapping bins and convolving spike times with a gaussian kernel.
 '''
 
+import math
+
 import numpy as np
 import pandas as pd
 from scipy import interpolate
 from brainbox import core
 
+try:
+    from numba import njit
+except ModuleNotFoundError:
+    njit = None
+
+
+def _group_indices(clusters, n_units):
+    """
+    Groups spike indices by cluster id with a single counting-sort pass: bincount the ids,
+    cumsum the counts into slot offsets, then scatter each spike index into its cluster's slot.
+    Equivalent to a stable argsort but runs in O(n_spikes) and, when numba is available, entirely
+    in compiled code.
+
+    :param clusters: int64 array of cluster ids, one per spike
+    :param n_units: number of clusters (max cluster id + 1)
+    :return: (order, offsets) where `order` is the permutation sorting spikes by cluster and
+        `offsets` [n_units + 1] holds each cluster's start/stop indices into the sorted arrays
+    """
+    counts = np.bincount(clusters, minlength=n_units)
+    offsets = np.empty(n_units + 1, dtype=np.int64)
+    offsets[0] = 0
+    offsets[1:] = np.cumsum(counts)
+    order = np.empty(clusters.size, dtype=np.int64)
+    next_slot = offsets[:-1].copy()
+    for i in range(clusters.size):
+        c = clusters[i]
+        order[next_slot[c]] = i
+        next_slot[c] += 1
+    return order, offsets
+
+
+if njit is not None:
+    _group_indices = njit(cache=True)(_group_indices)
+
+
+def _bincount2d_hist(x, y, xlim0, inv_xbin, ylim0, inv_ybin, nx, ny):
+    """
+    Accumulates the 2D histogram in a single typed loop: bin index computation and count
+    accumulation are fused, so no index temporaries are allocated. Values falling outside the
+    requested limits raise ValueError, as in the generic bincount path. Compiled with numba when
+    it is installed; bincount2D only dispatches here in that case.
+    """
+    out = np.zeros((ny, nx), dtype=np.int64)
+    for i in range(x.size):
+        xi = int(math.floor((x[i] - xlim0) * inv_xbin))
+        yi = int(math.floor((y[i] - ylim0) * inv_ybin))
+        if xi < 0 or xi >= nx or yi < 0 or yi >= ny:
+            raise ValueError('values outside of the requested limits')
+        out[yi, xi] += 1
+    return out
+
+
+if njit is not None:
+    _bincount2d_hist = njit(cache=True)(_bincount2d_hist)
+
 
 def sync(dt, times=None, values=None, timeseries=None, offsets=None, interp='zero',
          fillval=np.nan):
@@ -63,12 +120,15 @@ def sync(dt, times=None, values=None, timeseries=None, offsets=None, interp='zer
     if (times is not None) or (values is not None):
         if len(times) != len(values):
             raise ValueError('\'times\' and \'values\' must have the same number of elements.')
-        if type(times[0]) is np.ndarray:
-            if not all([t.shape == v.shape for t, v in zip(times, values)]):
+        # duck-typed check: a list of arrays (one per series) has array-like first elements,
+        # whereas a single series of timestamps yields scalars; avoids the type identity test
+        # which missed ndarray subclasses such as memmaps
+        if getattr(times[0], 'ndim', 0) > 0:
+            if not all(t.shape == v.shape for t, v in zip(times, values)):
                 raise ValueError('All arrays in \'times\' must match the shape of the'
                                  ' corresponding entry in \'values\'.')
             # If all checks are passed, convert all times and values args into TimeSeries objects
-            timeseries.extend([core.TimeSeries(t, v) for t, v in zip(times, values)])
+            timeseries.extend(core.TimeSeries(t, v) for t, v in zip(times, values))
         else:
             # If times and values are only numpy arrays and lists of arrays, pair them and add
             timeseries.append(core.TimeSeries(times, values))
@@ -105,9 +165,51 @@ def sync(dt, times=None, values=None, timeseries=None, offsets=None, interp='zer
         newt = np.arange(tmin, tmax + 1.0001 * (dt - (tmax - tmin) % dt), dt)
     else:
         newt = np.arange(tmin, tmax, dt)
-    tsinterps = [interpolate.interp1d(ts.times, ts.values, kind=interp, fill_value=fillval, axis=0)
-                 for ts in timeseries]
-    syncd = core.TimeSeries(newt, np.hstack([tsi(newt) for tsi in tsinterps]), columns=colnames)
+    # interpolate each series into a slice of a preallocated output rather than hstacking the
+    # per-series results, which would allocate every column twice
+    ncols = sum(ts.values.shape[1] for ts in timeseries)
+    values = np.empty((newt.size, ncols),
+                      dtype=np.result_type(np.float64, *[ts.values.dtype for ts in timeseries]))
+    col = 0
+    for ts in timeseries:
+        w = ts.values.shape[1]
+        block = values[:, col:col + w]
+        # the fast paths rely on monotonically increasing timestamps, whereas interp1d sorts
+        # internally; unsorted series fall through to the generic branch
+        fastpath = interp in ('linear', 'zero') and np.isscalar(fillval) and \
+            bool(np.all(np.diff(ts.times) >= 0))
+        if fastpath and interp == 'linear':
+            # np.interp is much cheaper than an interp1d object for piecewise-linear
+            # resampling; it clamps outside of the data range so the end segments are
+            # extrapolated manually when requested
+            for j in range(w):
+                v = ts.values[:, j]
+                if fillval == 'extrapolate':
+                    t = ts.times
+                    block[:, j] = np.interp(newt, t, v)
+                    ileft = newt < t[0]
+                    if np.any(ileft):
+                        block[ileft, j] = v[0] + (newt[ileft] - t[0]) * \
+                            (v[1] - v[0]) / (t[1] - t[0])
+                    iright = newt > t[-1]
+                    if np.any(iright):
+                        block[iright, j] = v[-1] + (newt[iright] - t[-1]) * \
+                            (v[-1] - v[-2]) / (t[-1] - t[-2])
+                else:
+                    block[:, j] = np.interp(newt, ts.times, v, left=fillval, right=fillval)
+        elif fastpath:
+            # previous-neighbour resampling reduces to a searchsorted gather
+            idx = np.searchsorted(ts.times, newt, side='right') - 1
+            np.clip(idx, 0, ts.times.size - 1, out=idx)
+            block[:] = ts.values[idx, :]
+            if fillval != 'extrapolate':
+                block[(newt < ts.times[0]) | (newt > ts.times[-1]), :] = fillval
+        else:
+            tsi = interpolate.interp1d(ts.times, ts.values, kind=interp, fill_value=fillval,
+                                       axis=0)
+            block[:] = tsi(newt)
+        col += w
+    syncd = core.TimeSeries(newt, values, columns=colnames)
     return syncd
 
 
@@ -136,11 +238,31 @@ def bincount2D(x, y, xbin=0, ybin=0, xlim=None, ylim=None, weights=None):
     if ylim is None:
         ylim = [np.min(y), np.max(y)]
 
+    # fast path: unweighted histogram with scalar bin sizes runs in a single compiled loop
+    if njit is not None and weights is None and \
+            isinstance(x, np.ndarray) and isinstance(y, np.ndarray) and \
+            np.isscalar(xbin) and xbin != 0 and np.isscalar(ybin) and ybin != 0:
+        xscale = np.arange(xlim[0], xlim[1] + xbin / 2, xbin)
+        yscale = np.arange(ylim[0], ylim[1] + ybin / 2, ybin)
+        r = _bincount2d_hist(x, y, float(xlim[0]), 1. / xbin, float(ylim[0]), 1. / ybin,
+                             xscale.size, yscale.size)
+        return r, xscale, yscale
+
     def _get_scale_and_indices(v, bin, lim):
         # if bin is a nonzero scalar, this is a bin size: create scale and indices
         if np.isscalar(bin) and bin != 0:
             scale = np.arange(lim[0], lim[1] + bin / 2, bin)
-            ind = (np.floor((v - lim[0]) / bin)).astype(np.int64)
+            if np.issubdtype(np.asarray(v).dtype, np.integer) and \
+                    float(bin).is_integer() and float(lim[0]).is_integer():
+                # integer samples: exact floor division without any float temporary
+                ind = (v - int(lim[0])) // int(bin)
+            else:
+                # reuse a single float temporary in place and multiply by the reciprocal
+                # rather than dividing per element
+                ind = np.asarray(v - lim[0], dtype=np.float64)
+                ind *= 1. / bin
+                np.floor(ind, out=ind)
+                ind = ind.astype(np.int64)
         # if bin == 0, aggregate over unique values
         else:
             scale, ind = np.unique(v, return_inverse=True)
@@ -148,9 +270,14 @@ def bincount2D(x, y, xbin=0, ybin=0, xlim=None, ylim=None, weights=None):
 
     xscale, xind = _get_scale_and_indices(x, xbin, xlim)
     yscale, yind = _get_scale_and_indices(y, ybin, ylim)
-    # aggregate by using bincount on absolute indices for a 2d array
+    # aggregate by using bincount on absolute indices for a 2d array; the flat index is computed
+    # directly rather than through ravel_multi_index to avoid the temporary 2 x n index matrix
     nx, ny = [xscale.size, yscale.size]
-    ind2d = np.ravel_multi_index(np.c_[yind, xind].transpose(), dims=(ny, nx))
+    # out-of-limit samples raise explicitly on both axes, consistently with the compiled path;
+    # without this check a negative y index could alias into a valid flat index below
+    if np.any(xind < 0) or np.any(xind >= nx) or np.any(yind < 0) or np.any(yind >= ny):
+        raise ValueError('values outside of the requested limits')
+    ind2d = yind * nx + xind
     r = np.bincount(ind2d, minlength=nx * ny, weights=weights).reshape(ny, nx)
 
     # if a set of specific values is requested output an array matching the scale dimensions
@@ -196,12 +323,14 @@ def bin_spikes(spikes, binsize, interval_indices=False):
         raise AttributeError('Input spikes need to have a clusters attribute. Make sure you set '
                              'columns=(\'clusters\',)) when constructing spikes.')
 
-    rates, tbins, clusters = bincount2D(spikes.times, spikes.clusters, binsize)
+    # bin time along the first output dimension so the T x N counts come out contiguous in the
+    # layout that is returned, instead of transposing (and thus copying) after the fact
+    rates, clusters, tbins = bincount2D(spikes.clusters, spikes.times, xbin=0, ybin=binsize)
     if interval_indices:
         intervals = pd.interval_range(tbins[0], tbins[-1], freq=binsize, closed='left')
-        return core.TimeSeries(times=intervals, values=rates.T[:-1], columns=clusters)
+        return core.TimeSeries(times=intervals, values=rates[:-1], columns=clusters)
     else:
-        return core.TimeSeries(times=tbins, values=rates.T, columns=clusters)
+        return core.TimeSeries(times=tbins, values=rates, columns=clusters)
 
 
 def get_units_bunch(spks_b, *args):
@@ -239,9 +368,7 @@ def get_units_bunch(spks_b, *args):
         >>> spks_b = aio.load_object(path_to_alf_out, 'spikes')
         >>> units_b = bb.processing.get_units_bunch(spks_b)
         # Get amplitudes for unit 4.
-        >>> amps = units_b['amps']['4']
-
-    TODO add computation time estimate?
+        >>> amps = units_b['amps'][4]
     '''
 
     # Initialize `units`
@@ -254,16 +381,17 @@ def get_units_bunch(spks_b, *args):
     # Get unit id for each spike and number of units. *Note: `n_units` might not equal `len(units)`
     # because some clusters may be empty (due to a "wontfix" bug in ks2).
     spks_unit_id = spks_b['clusters']
-    n_units = np.max(spks_unit_id)
-    units = np.unique(spks_b['clusters'])
-    # For each key in `units`, iteratively get each unit's values and add as a key to a bunch,
-    # `feat_bunch`. After iterating through all units, add `feat_bunch` as a key to `units`:
+    n_units = int(np.max(spks_unit_id)) + 1
+    # Group spikes by unit id once: slicing the sorted arrays on the unit boundaries replaces a
+    # `np.where(spks_unit_id == unit)` scan per unit, which is O(n_spikes * n_units).
+    order, boundaries = _group_indices(np.asarray(spks_unit_id, dtype=np.int64), n_units)
+    # For each key in `units`, get each unit's values by slicing the sorted feature array and add
+    # them as a key to a bunch, `feat_bunch`. Empty clusters yield empty arrays:
     for feat in feat_keys:
-        # Initialize `feat_bunch` with a key for each unit.
-        feat_bunch = core.Bunch((str(unit), np.array([])) for unit in np.arange(n_units))
-        for unit in units:
-            unit_idxs = np.where(spks_unit_id == unit)[0]
-            feat_bunch[str(unit)] = spks_b[feat][unit_idxs]
+        sorted_feat = spks_b[feat][order]
+        feat_bunch = core.Bunch(
+            (unit, sorted_feat[boundaries[unit]:boundaries[unit + 1]])
+            for unit in range(n_units))
         units_b[feat] = feat_bunch
     return units_b
 
@@ -1,6 +1,7 @@
 from brainbox import core, processing
 import unittest
 import numpy as np
+from scipy import interpolate
 
 
 class TestProcessing(unittest.TestCase):
@@ -61,6 +62,15 @@ class TestProcessing(unittest.TestCase):
         self.assertTrue(times.max() <= resamp2.times.max())
         self.assertTrue(times2.min() >= resamp2.times.min())
         self.assertTrue(times2.max() <= resamp2.times.max())
+        # The linear and zero interpolation paths must match the generic interp1d result,
+        # also when the timestamps are passed unsorted (interp1d sorts internally)
+        ishuf = np.random.permutation(times.size)
+        for kind in ('linear', 'zero'):
+            for t, v in ((times, samples), (times[ishuf], samples[ishuf])):
+                resamp = processing.sync(0.1, times=t, values=v, interp=kind,
+                                         fillval='extrapolate')
+                tsi = interpolate.interp1d(t, v, kind=kind, fill_value='extrapolate')
+                self.assertTrue(np.allclose(resamp.values[:, 0], tsi(resamp.times)))
 
     def test_bincount_2d(self):
         # first test simple with indices
@@ -97,10 +107,39 @@ class TestProcessing(unittest.TestCase):
         self.assertTrue(np.all(xscale == np.arange(5) + 10))
         self.assertTrue(np.all(yscale == np.arange(3) + 10))
         self.assertTrue(np.all(r.shape == (3, 5)))
+        # the unweighted histogram path must agree with the generic bincount path, which
+        # passing unit weights forces
+        t = np.random.rand(10000) * 50
+        c = np.floor(np.random.rand(10000) * 10)
+        r, xscale, yscale = processing.bincount2D(t, c, xbin=0.3, ybin=1)
+        r_, xscale_, yscale_ = processing.bincount2D(t, c, xbin=0.3, ybin=1,
+                                                     weights=np.ones_like(t))
+        self.assertTrue(np.all(r == r_))
+        self.assertTrue(np.all(xscale == xscale_) and np.all(yscale == yscale_))
+        # both paths raise when samples fall outside of the requested limits
+        with self.assertRaises(ValueError):
+            processing.bincount2D(t, c, xbin=0.3, ybin=1, xlim=[10, 40])
+        with self.assertRaises(ValueError):
+            processing.bincount2D(t, c, xbin=0.3, ybin=1, xlim=[10, 40],
+                                  weights=np.ones_like(t))
 
 
 def test_get_unit_bunches():
-    pass
+    # build a spikes bunch with an empty cluster (id 1) and per-spike features
+    spikes = core.Bunch({'clusters': np.array([0, 2, 0, 2, 2]),
+                         'times': np.array([0.1, 0.2, 0.3, 0.4, 0.5]),
+                         'amps': np.arange(5)})
+    units = processing.get_units_bunch(spikes)
+    # all spikes keys are carried over and units are keyed by integer id
+    assert set(units.keys()) == {'clusters', 'times', 'amps'}
+    assert list(units['times'].keys()) == [0, 1, 2]
+    assert np.all(units['times'][0] == np.array([0.1, 0.3]))
+    assert np.all(units['amps'][2] == np.array([1, 3, 4]))
+    # empty clusters yield empty arrays
+    assert units['times'][1].size == 0
+    # restricting the features restricts the returned keys
+    units = processing.get_units_bunch(spikes, ['amps'])
+    assert set(units.keys()) == {'amps'}
 
 
 if __name__ == "__main__":
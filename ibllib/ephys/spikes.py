@@ -130,11 +130,20 @@ def sync_spike_sorting(ap_file, out_path):
         # remove the alf folder if the sync failed
         shutil.rmtree(out_path)
         return None, 1
-    # patch the spikes.times files manually
+    # patch the spikes.times files manually: stream chunk by chunk through memory-mapped files
+    # rather than loading, converting and saving the full vectors, which halves the IO and keeps
+    # the memory footprint constant regardless of the number of spikes
     st_file = out_path.joinpath('spikes.times.npy')
-    spike_samples = np.load(out_path.joinpath('spikes.samples.npy'))
-    interp_times = apply_sync(sync_file, spike_samples / _sr(ap_file), forward=True)
-    np.save(st_file, interp_times)
+    sr = _sr(ap_file)
+    spike_samples = np.load(out_path.joinpath('spikes.samples.npy'), mmap_mode='r',
+                            allow_pickle=False)
+    interp_times = np.lib.format.open_memmap(
+        st_file, mode='w+', dtype=np.float64, shape=spike_samples.shape)
+    CHUNK_SIZE = 2 ** 21  # 16 MiB of float64 per chunk
+    for first in np.arange(0, spike_samples.size, CHUNK_SIZE):
+        sl = slice(first, first + CHUNK_SIZE)
+        interp_times[sl] = apply_sync(sync_file, spike_samples[sl] / sr, forward=True)
+    interp_times.flush()
     # get the list of output files
     out_files.extend([f for f in out_path.glob("*.*") if
                       f.name.startswith(('channels.', 'clusters.', 'spikes.', 'templates.',
@@ -22,14 +22,30 @@ def apply_sync(sync_file, times, forward=True):
     otherwise
     :return: interpolated times
     """
-    sync_points = np.load(sync_file)
+    sync_points = np.load(sync_file, allow_pickle=False)
     if forward:
-        fcn = interp1d(sync_points[:, 0],
-                       sync_points[:, 1], fill_value='extrapolate')
+        xp, fp = sync_points[:, 0], sync_points[:, 1]
     else:
-        fcn = interp1d(sync_points[:, 1],
-                       sync_points[:, 0], fill_value='extrapolate')
-    return fcn(times)
+        xp, fp = sync_points[:, 1], sync_points[:, 0]
+    times = np.asarray(times)
+    if xp.size == 2:
+        # single pair of sync points (e.g. single probe or linear sync): the map is affine
+        slope = (fp[1] - fp[0]) / (xp[1] - xp[0])
+        return slope * (times - xp[0]) + fp[0]
+    # the masked extrapolation below needs a 1d array; scalar input gets a scalar back
+    scalar = times.ndim == 0
+    times = np.atleast_1d(times)
+    # np.interp is much cheaper than building a scipy interp1d object, but clamps outside of
+    # the sync points range, so extrapolate the first / last segments manually
+    interp_times = np.interp(times, xp, fp)
+    ileft = times < xp[0]
+    if np.any(ileft):
+        interp_times[ileft] = fp[0] + (times[ileft] - xp[0]) * (fp[1] - fp[0]) / (xp[1] - xp[0])
+    iright = times > xp[-1]
+    if np.any(iright):
+        interp_times[iright] = \
+            fp[-1] + (times[iright] - xp[-1]) * (fp[-1] - fp[-2]) / (xp[-1] - xp[-2])
+    return interp_times[0] if scalar else interp_times
 
 
 def sync(ses_path, **kwargs):
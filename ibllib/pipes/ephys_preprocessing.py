@@ -2,6 +2,8 @@ import re
 from pathlib import Path
 import logging
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import os
 import subprocess
 import shutil
 
@@ -19,6 +21,20 @@ from ibllib.qc.task_extractors import TaskQCExtractor
 _logger = logging.getLogger('ibllib')
 
 
+def _convert_and_sync_probe(session_path, ap_file, label, ks2_dir, ampfactor):
+    """
+    ALF conversion and spike sorting synchronisation for a single probe. Module-level so that
+    SpikeSorting_KS2_Matlab can run probes concurrently in worker processes.
+    :return: list of output files for the probe
+    """
+    probe_out_path = session_path.joinpath('alf', label)
+    probe_out_path.mkdir(parents=True, exist_ok=True)
+    spikes.ks2_to_alf(ks2_dir, bin_path=ap_file.parent, out_path=probe_out_path,
+                      bin_file=ap_file, ampfactor=ampfactor)
+    out, _ = spikes.sync_spike_sorting(ap_file=ap_file, out_path=probe_out_path)
+    return out
+
+
 #  level 0
 class EphysPulses(tasks.Task):
     """
@@ -172,20 +188,31 @@ class SpikeSorting_KS2_Matlab(tasks.Task):
         efiles = spikeglx.glob_ephys_files(self.session_path)
         ap_files = [(ef.get('ap'), ef.get('label')) for ef in efiles if 'ap' in ef.keys()]
         out_files = []
+        # runs ks2 serially for each probe (skips if it already ran): the sorter monopolizes
+        # the GPU and the scratch drive, so probes cannot be sorted concurrently
+        sorted_probes = []
         for ap_file, label in ap_files:
             try:
-                ks2_dir = self._run_ks2(ap_file)  # runs ks2, skips if it already ran
-                probe_out_path = self.session_path.joinpath('alf', label)
-                probe_out_path.mkdir(parents=True, exist_ok=True)
-                spikes.ks2_to_alf(
-                    ks2_dir, bin_path=ap_file.parent, out_path=probe_out_path,
-                    bin_file=ap_file, ampfactor=self._sample2v(ap_file))
-                out, _ = spikes.sync_spike_sorting(ap_file=ap_file, out_path=probe_out_path)
-                out_files.extend(out)
+                ks2_dir = self._run_ks2(ap_file)
+                sorted_probes.append((ap_file, label, ks2_dir))
             except BaseException as err:
                 _logger.error(err)
                 self.status = -1
                 continue
+        # the ALF conversion and spike sorting synchronisation are independent across probes:
+        # run them concurrently, one worker process per probe
+        if sorted_probes:
+            with ProcessPoolExecutor(
+                    max_workers=min(len(sorted_probes), os.cpu_count())) as pool:
+                futures = [pool.submit(_convert_and_sync_probe, self.session_path, ap_file,
+                                       label, ks2_dir, self._sample2v(ap_file))
+                           for ap_file, label, ks2_dir in sorted_probes]
+                for future in futures:
+                    try:
+                        out_files.extend(future.result())
+                    except BaseException as err:
+                        _logger.error(err)
+                        self.status = -1
 
         probe_files = spikes.probes_description(self.session_path, one=self.one)
         return out_files + probe_files